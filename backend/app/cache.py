@@ -0,0 +1,39 @@
+# app/cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Tuple
+
+
+class TTLCache:
+    """
+    항목마다 만료 시간(ttl초)이 있는 프로세스 내 캐시.
+    maxsize를 넘으면 가장 오래 전에 저장된 항목부터 제거합니다.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key, default=None):
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        self._data.pop(key, None)
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -1,16 +1,26 @@
 # app/db.py
 from pathlib import Path
-from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 import _sqlite3
+
 BASE_DIR = Path(__file__).resolve().parent.parent   # backend/
 DATA_DIR = BASE_DIR / "data"                        # backend/data/
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 DB_PATH  = DATA_DIR / "app.sqlite3"                 # backend/data/app.sqlite3
 
-engine = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False}, echo=True, future=True)
+# 비동기 드라이버(aiosqlite) 사용: DB 대기 중에도 이벤트 루프/스레드풀을 점유하지 않음
+engine = create_async_engine(
+    f"sqlite+aiosqlite:///{DB_PATH}",
+    echo=True,
+    insertmanyvalues_page_size=1000,  # add_all() 등 다건 INSERT를 1000행 단위 multi-VALUES로 묶음
+    query_cache_size=1200,            # 컴파일된 SQL 캐시 (반복되는 목록/단건 조회의 컴파일 생략)
+    pool_size=20,
+    max_overflow=30,
+    pool_timeout=5,                   # 풀이 가득 찼을 때 커넥션 대기 최대 5초
+)
 
-@event.listens_for(engine,"connect")
+@event.listens_for(engine.sync_engine,"connect")
 
 def set_sqlite_pragma(c, _): 
     cur = c.cursor()
@@ -19,15 +29,15 @@ def set_sqlite_pragma(c, _):
     cur.execute("PRAGMA synchronous=NORMAL")
     cur.close()
 
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
+# expire_on_commit=False: 비동기 세션에서는 commit 후 속성 접근 시 암묵적 재조회(lazy load)가 불가하고,
+# commit 직후 refresh()로 다시 SELECT 할 필요도 없어짐
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-        db.commit()
-    except:
-        db.rollback(); 
-        raise
-    finally:
-        db.close()
\ No newline at end of file
+async def get_db():
+    async with SessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except:
+            await db.rollback()
+            raise
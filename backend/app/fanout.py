@@ -0,0 +1,129 @@
+# app/fanout.py
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, insert, update, delete, literal, func
+
+from app.db import SessionLocal
+from app.models import CircleNews, Followed, NewsOutbox, UserSchedule
+
+FANOUT_CHUNK_SIZE = 5000
+FANOUT_RETRIES = 3           # 실패 시 재시도 횟수 (1, 2, 4초 간격)
+FANOUT_SWEEP_INTERVAL = 60   # 남아 있는 pending 작업을 다시 처리하는 주기(초)
+
+logger = logging.getLogger(__name__)
+
+
+async def run_news_fanout(outbox_id: int) -> None:
+    """
+    outbox 1건 처리: 서클 팔로워에게 뉴스 스케줄을 FANOUT_CHUNK_SIZE 명씩 나눠 생성합니다.
+    chunk마다 진행 위치(last_followed_id)를 함께 커밋하므로, 중간에 실패해도 다시 실행하면 이어서 처리됩니다.
+    같은 작업이 동시에 여러 번 실행돼도(워커 여러 개, 재시작 시 재개 등) 진행 위치를 compare-and-set 으로
+    옮기므로 한 chunk는 한 번만 커밋됩니다. 모두 끝나면 outbox 행을 삭제합니다.
+    """
+    async with SessionLocal() as db:
+        job = await db.get(NewsOutbox, outbox_id)
+        if job is None:
+            return
+        news = await db.get(CircleNews, job.news_id)
+        circle_id, cursor = job.circle_id, job.last_followed_id
+        await db.commit()
+
+        while True:
+            # 이번 chunk의 마지막 followed.id
+            chunk = (
+                select(Followed.id)
+                .where(Followed.circle_id == circle_id, Followed.id > cursor)
+                .order_by(Followed.id)
+                .limit(FANOUT_CHUNK_SIZE)
+                .subquery()
+            )
+            last_id = (await db.execute(select(func.max(chunk.c.id)))).scalar()
+            if last_id is None:
+                break
+
+            followers = select(
+                Followed.user_id,
+                literal(news.id),
+                literal(news.title),
+                literal(news.date),
+                literal(news.date),
+                literal(news.content or None),
+            ).where(
+                Followed.circle_id == circle_id,
+                Followed.id > cursor,
+                Followed.id <= last_id,
+            )
+            await db.execute(
+                insert(UserSchedule).from_select(
+                    ["user_id", "circlenews_id", "title", "start_at", "end_at", "memo"],
+                    followers,
+                )
+            )
+            # 진행 위치가 읽었을 때 그대로일 때만 전진. 다른 실행이 먼저 처리한 chunk면 삽입까지 롤백하고 종료
+            advanced = (await db.execute(
+                update(NewsOutbox)
+                .where(NewsOutbox.id == outbox_id, NewsOutbox.last_followed_id == cursor)
+                .values(last_followed_id=last_id)
+                .returning(NewsOutbox.id)
+            )).first()
+            if advanced is None:
+                await db.rollback()
+                return
+            await db.commit()
+            cursor = last_id
+
+        await db.execute(
+            delete(NewsOutbox).where(NewsOutbox.id == outbox_id, NewsOutbox.last_followed_id == cursor)
+        )
+        await db.commit()
+
+
+async def run_news_fanout_with_retry(outbox_id: int) -> None:
+    """BackgroundTask 용: 실패하면 백오프 후 재시도 (이어서 처리되므로 재시도해도 중복 없음)"""
+    for attempt in range(FANOUT_RETRIES + 1):
+        try:
+            await run_news_fanout(outbox_id)
+            return
+        except Exception:
+            if attempt == FANOUT_RETRIES:
+                # 재시도를 다 써도 pending 으로 남으므로 resume_pending_fanouts 가 다시 처리
+                logger.exception("news fanout failed: outbox_id=%s", outbox_id)
+                return
+            logger.warning("news fanout failed, retrying: outbox_id=%s", outbox_id, exc_info=True)
+            await asyncio.sleep(2 ** attempt)
+
+
+async def sweep_pending_fanouts(older_than: float = 0) -> None:
+    """older_than초 이전에 만들어진 pending outbox 작업을 다시 처리"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=older_than)
+    async with SessionLocal() as db:
+        pending = (await db.execute(
+            select(NewsOutbox.id)
+            .where(NewsOutbox.status == "pending", NewsOutbox.created_at < cutoff)
+            .order_by(NewsOutbox.id)
+        )).scalars().all()
+    for outbox_id in pending:
+        # 한 작업이 실패해도 나머지는 계속 처리 (실패한 작업은 pending 으로 남아 다음 주기에 다시 시도)
+        try:
+            await run_news_fanout(outbox_id)
+        except Exception:
+            logger.exception("news fanout failed: outbox_id=%s", outbox_id)
+
+
+async def resume_pending_fanouts() -> None:
+    """
+    서버 재시작이나 재시도 소진으로 끝나지 못한 outbox 작업을 주기적으로 다시 처리.
+    방금 만들어져 BackgroundTask 가 처리 중일 작업과 겹치지 않도록 한 주기 이상 지난 작업만 대상으로 합니다.
+    """
+    async with SessionLocal() as db:
+        # 완료 시 행을 지우기 전 버전에서 남은 done 행 정리
+        await db.execute(delete(NewsOutbox).where(NewsOutbox.status == "done"))
+        await db.commit()
+    while True:
+        try:
+            await sweep_pending_fanouts(older_than=FANOUT_SWEEP_INTERVAL)
+        except Exception:
+            logger.exception("news fanout sweep failed")
+        await asyncio.sleep(FANOUT_SWEEP_INTERVAL)
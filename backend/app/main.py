@@ -1,15 +1,51 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.db import engine,DB_PATH
-from app.models import Base
+from sqlalchemy import text
+from app.db import engine,DB_PATH,SessionLocal
+from app.fanout import resume_pending_fanouts
+from app.models import Base, create_missing_indexes, create_search_indexes
 from app.routers import users, user_schedules, circles,circle_news,notifications,followed, auth
 from fastapi.middleware.cors import CORSMiddleware
 
+# 서버 시작 시 자주 쓰는 쿼리를 미리 컴파일해 둘 라우터 (각 모듈의 warm_up)
+_WARM_ROUTERS = [circles, circle_news, users, followed]
+
+
+async def _warm_up() -> None:
+    """배포 직후 첫 요청이 느리지 않도록 커넥션 풀과 SQL 컴파일 캐시를 미리 채움"""
+    # 일부 연결이 실패해도 열린 연결은 모두 닫고 나서 에러를 올림
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(engine.pool.size())), return_exceptions=True
+    )
+    conns = [r for r in results if not isinstance(r, BaseException)]
+    try:
+        for conn in conns:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in conns:
+            await conn.close()
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        raise errors[0]
+
+    async with SessionLocal() as db:
+        for module in _WARM_ROUTERS:
+            await module.warm_up(db)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)  
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_missing_indexes)
+        await conn.run_sync(create_search_indexes)
+    await _warm_up()
     print("DB_PATH =>", DB_PATH)
+    # 끝나지 못한 뉴스 팬아웃 작업을 주기적으로 다시 처리 (재시작, 재시도 소진 등)
+    resume = asyncio.create_task(resume_pending_fanouts())
     yield
+    resume.cancel()
 
 app = FastAPI(title="DB App", lifespan=lifespan)
 app.include_router(users.router)
@@ -1,8 +1,9 @@
 # backend/app/models.py
 
 from __future__ import annotations
+import sqlite3
 from datetime import date, datetime, timezone
-from sqlalchemy import String, Integer, Boolean, Date, DateTime, Text, ForeignKey, Index
+from sqlalchemy import String, Integer, Boolean, Date, DateTime, Text, ForeignKey, Index, table, column
 from sqlalchemy.orm import Mapped, mapped_column, declarative_base
 from sqlalchemy.dialects.sqlite import JSON
 from typing import Optional
@@ -58,6 +59,17 @@ class CircleNews(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
 
+class NewsOutbox(Base):
+    """뉴스 팬아웃(팔로워 스케줄 생성) 작업 대기열. 요청과 같은 트랜잭션에서 기록되고 백그라운드에서 처리됨"""
+    __tablename__ = "news_outbox"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    news_id: Mapped[int] = mapped_column(Integer, ForeignKey("circle_news.id", ondelete="CASCADE"), index=True, nullable=False)
+    circle_id: Mapped[int] = mapped_column(Integer, ForeignKey("circles.id", ondelete="CASCADE"), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), default="pending", index=True, nullable=False)  # pending (완료되면 행 삭제)
+    last_followed_id: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # 처리 완료한 마지막 followed.id (재시도 시 이어서 처리)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+
 class Notification(Base):
     __tablename__ = "notifications"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -79,4 +91,59 @@ class Followed(Base):
 
 
 Index("uq_followed_user_circle", Followed.user_id, Followed.circle_id, unique=True)
-Index("idx_followed_circle_admin", Followed.circle_id, Followed.is_admin)
\ No newline at end of file
+Index("idx_followed_circle_admin", Followed.circle_id, Followed.is_admin)
+Index("ix_followed_circle_user", Followed.circle_id, Followed.user_id)  # 뉴스 팬아웃 (circle_id -> user_id)
+Index("ix_circle_news_circle_date_id", CircleNews.circle_id, CircleNews.date.desc(), CircleNews.id.desc())  # 뉴스 목록 정렬
+
+
+def create_missing_indexes(conn) -> None:
+    """create_all은 이미 있는 테이블에 새 인덱스를 추가하지 않으므로, 기존 DB에도 인덱스를 보장"""
+    for tbl in Base.metadata.sorted_tables:
+        for index in tbl.indexes:
+            index.create(conn, checkfirst=True)
+
+
+# =========================
+# 부분 문자열 검색 (FTS5 trigram)
+# LIKE '%x%' 는 일반 인덱스를 못 타므로, trigram 토크나이저의 FTS5 테이블로 검색
+# trigram 토크나이저는 SQLite 3.34+ 에서만 지원. 그보다 오래된 SQLite에서는 FTS 테이블을 만들지 않고
+# 라우터가 기존 lower(...) LIKE 검색으로 동작
+# =========================
+
+FTS_TRIGRAM_AVAILABLE = sqlite3.sqlite_version_info >= (3, 34, 0)
+
+circle_news_fts = table("circle_news_fts", column("rowid"), column("title"), column("content"))
+users_fts = table("users_fts", column("rowid"), column("name"), column("email"), column("login_id"))
+
+_SEARCH_INDEXES = {
+    "circle_news_fts": ("circle_news", ["title", "content"]),
+    "users_fts": ("users", ["name", "email", "login_id"]),
+}
+
+
+def _fts_ddl(fts: str, source: str, columns: list[str]) -> list[str]:
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old});"
+    insert_new = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{source}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {source} BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def create_search_indexes(conn) -> None:
+    """검색용 FTS5 테이블과 동기화 트리거 생성 (처음 만들 때는 기존 행으로 인덱스를 채움)"""
+    if not FTS_TRIGRAM_AVAILABLE:
+        return
+    for fts, (source, columns) in _SEARCH_INDEXES.items():
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+        ).first()
+        for ddl in _fts_ddl(fts, source, columns):
+            conn.exec_driver_sql(ddl)
+        if not exists:
+            conn.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
@@ -1,6 +1,7 @@
 # app/routers/auth.py
 from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.db import get_db
 from app.models import User
@@ -17,15 +18,16 @@ class LoginIn(BaseModel):
     password: str = Field(..., min_length=1)
 
 @router.post("/login", response_model=UserOut)
-def login(payload: LoginIn, response: Response, db: Session = Depends(get_db)):
+async def login(payload: LoginIn, response: Response, db: AsyncSession = Depends(get_db)):
     #일치하는 유저 정보 가져오기
-    user = db.execute(select(User).where(User.login_id == payload.login_id)).scalar_one_or_none()
+    user = (await db.execute(select(User).where(User.login_id == payload.login_id))).scalar_one_or_none()
 
     #1. 아이디가 존재하지 않는경우 
     if not user:
         raise HTTPException(status_code=401, detail="User does not exist")
     #2. 비밀번호가 틀린경우 (해쉬비밀번호 해석)
-    if not verify_pw(payload.password, user.login_pass):
+    #   (해시 검증은 CPU 작업이라 스레드풀에서 실행)
+    if not await run_in_threadpool(verify_pw, payload.password, user.login_pass):
         raise HTTPException(status_code=401,detail="Incorrect password")
     
     #만약 아이디/패스워드가 맞다면 토큰 생성
@@ -47,13 +49,13 @@ def login(payload: LoginIn, response: Response, db: Session = Depends(get_db)):
 
 #로그아웃시, 세션값 삭제 
 @router.post("/logout")
-def logout(response: Response,):
+async def logout(response: Response,):
     response.delete_cookie(SESSION_COOKIE, path="/")
     return {"ok": True}
 
 #get_current_user(세션 존재여부 검사) 실행후 user 값 반환
 @router.get("/me", response_model=UserOut)
-def me(current: User = Depends(get_current_user)):
+async def me(current: User = Depends(get_current_user)):
     return current
 
 ##문제점
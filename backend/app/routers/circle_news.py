@@ -1,14 +1,15 @@
 # app/routers/circle_news.py
 from datetime import date
-from typing import Optional, List
+from typing import NoReturn, Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select, or_
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy import select, insert, update, delete, literal, or_, union, bindparam, lambda_stmt
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db
-from app.models import Circle, CircleNews,Followed,UserSchedule
+from app.fanout import run_news_fanout_with_retry
+from app.models import Circle, CircleNews, NewsOutbox, circle_news_fts, FTS_TRIGRAM_AVAILABLE
 from app.schemas import CircleNewsOut, CircleNewsCreate
 
 router = APIRouter(
@@ -16,47 +17,85 @@ router = APIRouter(
     tags=["circle_news"],
 )
 
+# ---------- statements ----------
+# 자주 쓰는 쿼리는 모듈 로드 시 한 번만 만들어 두고, 요청마다 바인드 값만 바꿔 실행
+
+_CIRCLE_EXISTS = select(literal(1)).where(Circle.id == bindparam("cid")).exists().select()
+
+# 목록은 ORM 엔티티 대신 테이블 컬럼 행으로 조회 (행 -> ORM 객체 변환/identity map 생략)
+_LIST_NEWS = lambda_stmt(lambda: select(CircleNews.__table__))
+
+
 # ---------- helpers ----------
 
-def _ensure_circle_exists(db: Session, circle_id: int) -> None:
-    exists = db.execute(
-        select(Circle.id).where(Circle.id == circle_id)
-    ).scalar_one_or_none()
+async def _ensure_circle_exists(db: AsyncSession, circle_id: int) -> None:
+    exists = (await db.execute(_CIRCLE_EXISTS, {"cid": circle_id})).scalar()
     if not exists:
         raise HTTPException(status_code=404, detail="circle not found")
 
 
+def _list_news_stmt(
+    circle_id: int,
+    size: int,
+    search: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+):
+    """뉴스 목록 쿼리 (라우트와 warm_up이 같은 lambda를 거쳐야 같은 컴파일 캐시 항목을 씀)"""
+    stmt = _LIST_NEWS + (lambda s: s.where(CircleNews.circle_id == circle_id))
+
+    if search:
+        like = f"%{search.strip()}%"
+        # title/content 부분 일치는 trigram 인덱스(circle_news_fts)로 검색 (대소문자 무시)
+        # 컬럼별로 나눠 UNION 해야 각 LIKE가 인덱스를 탐 (OR로 묶으면 전체 스캔)
+        if FTS_TRIGRAM_AVAILABLE:
+            stmt += lambda s: s.where(CircleNews.id.in_(union(
+                select(circle_news_fts.c.rowid).where(circle_news_fts.c.title.like(like)),
+                select(circle_news_fts.c.rowid).where(circle_news_fts.c.content.like(like)),
+            )))
+        else:
+            stmt += lambda s: s.where(or_(CircleNews.title.ilike(like), CircleNews.content.ilike(like)))
+
+    if date_from:
+        stmt += lambda s: s.where(CircleNews.date >= date_from)
+    if date_to:
+        stmt += lambda s: s.where(CircleNews.date <= date_to)
+
+    # 최신 날짜 우선, 같은 날이면 id 역순
+    stmt += lambda s: s.order_by(CircleNews.date.desc(), CircleNews.id.desc()).limit(size)
+    return stmt
+
+
+async def _news_not_found(db: AsyncSession, circle_id: int) -> NoReturn:
+    """뉴스를 못 찾았을 때만 서클 존재 여부를 확인해 404 사유(circle / circle_news)를 구분"""
+    await _ensure_circle_exists(db, circle_id)
+    raise HTTPException(status_code=404, detail="circle_news not found")
+
+
+async def warm_up(db: AsyncSession) -> None:
+    """서버 시작 시 자주 쓰는 쿼리를 한 번 실행해 SQL 컴파일 캐시를 채움 (존재하지 않는 id로 실행)"""
+    await db.execute(_CIRCLE_EXISTS, {"cid": 0})
+    await db.execute(_list_news_stmt(0, 50))
+
+
 # ---------- routes ----------
 
 @router.get("", response_model=List[CircleNewsOut])
-def list_circle_news(
+async def list_circle_news(
     circle_id: int,
     size: int = Query(50, ge=1, le=200, description="max number of items"),
     search: Optional[str] = Query(None, description="keyword (title/content)"),
     date_from: Optional[date] = Query(None, description="YYYY-MM-DD start (inclusive)"),
     date_to: Optional[date] = Query(None, description="YYYY-MM-DD end (inclusive)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """해당 서클의 뉴스 목록을 간단히 조회합니다."""
-    _ensure_circle_exists(db, circle_id)
-
-    stmt = select(CircleNews).where(CircleNews.circle_id == circle_id)
-
-    if search:
-        like = f"%{search.strip()}%"
-        # content가 NULL일 수도 있으니 title은 확실히 검색, content는 가능할 때만 검색
-        stmt = stmt.where(or_(CircleNews.title.ilike(like), CircleNews.content.ilike(like)))
-
-    if date_from:
-        stmt = stmt.where(CircleNews.date >= date_from)
-    if date_to:
-        stmt = stmt.where(CircleNews.date <= date_to)
+    await _ensure_circle_exists(db, circle_id)
 
-    # 최신 날짜 우선, 같은 날이면 id 역순
-    stmt = stmt.order_by(CircleNews.date.desc(), CircleNews.id.desc()).limit(size)
+    stmt = _list_news_stmt(circle_id, size, search, date_from, date_to)
 
     try:
-        return db.execute(stmt).scalars().all()
+        return (await db.execute(stmt)).mappings().all()
     except Exception as e:
         # 쿼리 빌드/파라미터 문제 등
         raise HTTPException(status_code=400, detail=f"query failed: {e}")
@@ -64,132 +103,104 @@ def list_circle_news(
 
 
 @router.post("", response_model=CircleNewsOut, status_code=status.HTTP_201_CREATED)
-def create_news(circle_id: int, payload: CircleNewsCreate, db: Session = Depends(get_db)):
+async def create_news(
+    circle_id: int,
+    payload: CircleNewsCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+):
     # 0) path/body 일치 검사
     if circle_id != payload.circle_id:
         raise HTTPException(status_code=400, detail="circle_id mismatch between path and body")
 
-    # 1) 뉴스 생성
-    news = CircleNews(
-        circle_id=payload.circle_id,
-        title=payload.title,
-        date=payload.date,
-        content=payload.content,
-        has_photo=payload.has_photo,
-        photo_url=payload.photo_url
-    )
-    db.add(news)
-    db.flush() 
-    db.refresh(news)  # news.id 필요
-
-    # 2) 팬아웃: 팔로워 → 스케줄 생성
-    follower_ids = db.scalars(
-        select(Followed.user_id).where(Followed.circle_id == news.circle_id)
-    ).all()
-
-    if follower_ids:
-        schedules_to_add = [
-            UserSchedule(
-                user_id=uid,
-                circlenews_id=news.id,
-                title=news.title,
-                start_at=news.date,
-                end_at=news.date,
-                memo=(news.content or None)
-            )
-            for uid in follower_ids
-        ]
-        db.add_all(schedules_to_add)
+    # 1) 뉴스 생성 (INSERT ... RETURNING 으로 id/created_at 까지 한 번에 받음)
+    news = (await db.execute(
+        insert(CircleNews).values(**payload.model_dump()).returning(CircleNews)
+    )).scalar_one()
+
+    # 2) 팬아웃: 같은 트랜잭션에 outbox만 기록하고, 팔로워 스케줄 생성은 응답 후 백그라운드에서 처리
+    outbox_id = (await db.execute(
+        insert(NewsOutbox).values(news_id=news.id, circle_id=news.circle_id).returning(NewsOutbox.id)
+    )).scalar_one()
 
     # 모든 변경사항을 한 번에 커밋
     try:
-        db.commit()
-        db.refresh(news)
+        await db.commit()
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=409, detail=f"unique constraint failed: {getattr(e, 'orig', e)}")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"create news failed: {e}")
 
+    background_tasks.add_task(run_news_fanout_with_retry, outbox_id)
     return news
 
 
 @router.get("/{news_id}", response_model=CircleNewsOut)
-def get_circle_news(
+async def get_circle_news(
     circle_id: int,
     news_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    _ensure_circle_exists(db, circle_id)
-
-    row = db.execute(
-        select(CircleNews).where(
-            CircleNews.circle_id == circle_id,
-            CircleNews.id == news_id
-        )
-    ).scalar_one_or_none()
-    if not row:
-        raise HTTPException(status_code=404, detail="circle_news not found")
+    # PK 조회는 Session.get: 같은 세션에서 이미 읽은 행이면 identity map에서 바로 반환 (SQL 없음)
+    row = await db.get(CircleNews, news_id)
+    if row is None or row.circle_id != circle_id:
+        await _news_not_found(db, circle_id)
     return row
 
 
 @router.put("/{news_id}", response_model=CircleNewsOut)
-def update_circle_news(
+async def update_circle_news(
     circle_id: int,
     news_id: int,
     payload: CircleNewsCreate,  # 별도의 Update 스키마가 없다면 전체 교체 형태로 유지
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    _ensure_circle_exists(db, circle_id)
-
-    row = db.execute(
-        select(CircleNews).where(
-            CircleNews.circle_id == circle_id,
-            CircleNews.id == news_id
-        )
-    ).scalar_one_or_none()
-    if not row:
-        raise HTTPException(status_code=404, detail="circle_news not found")
-
     # circle_id는 경로 기준, 나머지 필드 갱신
-    row.title = payload.title
-    row.content = payload.content
-    row.date = payload.date
-    row.has_photo = payload.has_photo
-
+    stmt = (
+        update(CircleNews)
+        .where(CircleNews.circle_id == circle_id, CircleNews.id == news_id)
+        .values(
+            title=payload.title,
+            content=payload.content,
+            date=payload.date,
+            has_photo=payload.has_photo,
+        )
+        .returning(CircleNews)
+    )
     try:
-        db.commit()
-        db.refresh(row)
-        return row
+        row = (await db.execute(stmt)).scalar_one_or_none()
+        await db.commit()
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=f"integrity error: {e.orig if hasattr(e, 'orig') else e}")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=f"cannot update circle_news: {e}")
 
+    if not row:
+        await _news_not_found(db, circle_id)
+    return row
+
 
 @router.delete("/{news_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_circle_news(
+async def delete_circle_news(
     circle_id: int,
     news_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    _ensure_circle_exists(db, circle_id)
-
-    row = db.execute(
-        select(CircleNews).where(
-            CircleNews.circle_id == circle_id,
-            CircleNews.id == news_id
-        )
-    ).scalar_one_or_none()
-    if not row:
-        raise HTTPException(status_code=404, detail="circle_news not found")
-
-    db.delete(row)
+    # 주의: user_schedules.circlenews_id 는 NOT NULL + ON DELETE SET NULL 이라, 일정이 만들어진 뉴스는 삭제가 실패함 (400)
+    stmt = delete(CircleNews).where(
+        CircleNews.circle_id == circle_id,
+        CircleNews.id == news_id,
+    ).returning(CircleNews.id)
     try:
-        db.commit()
+        deleted = (await db.execute(stmt)).first()
+        await db.commit()
     except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail=f"cannot delete circle_news: {e}")
\ No newline at end of file
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"cannot delete circle_news: {e}")
+
+    if deleted is None:
+        await _news_not_found(db, circle_id)
\ No newline at end of file
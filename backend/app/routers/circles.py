@@ -1,16 +1,38 @@
 # app/routers/circles.py
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, delete, lambda_stmt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
+from app.cache import TTLCache
 from app.db import get_db
 from app.models import Circle
 from app.schemas import CircleCreate, CircleUpdate, CircleOut
 
 router = APIRouter(prefix="/api/circles", tags=["circles"])
 
+# 목록 조회 쿼리는 모듈 로드 시 한 번만 생성 (요청마다 limit 값만 바인딩)
+# ORM 엔티티 대신 CircleOut에 필요한 컬럼만 조회 (identity map / 객체 생성 비용 없음)
+_LIST_CIRCLES = lambda_stmt(lambda: select(
+    Circle.id,
+    Circle.name,
+    Circle.description,
+    Circle.created_at,
+    Circle.followers,
+    Circle.image,
+    Circle.tags,
+    Circle.sns_links_x,
+    Circle.sns_links_instagram,
+    Circle.sns_links_line,
+))
+
+# 서클은 자주 바뀌지 않으므로 직렬화된 결과를 캐시 (쓰기 요청에서 무효화)
+_circle_cache = TTLCache(maxsize=10_000, ttl=60)    # circle_id -> CircleOut dict
+_circle_list_cache = TTLCache(maxsize=100, ttl=10)  # ("list", size) -> [CircleOut dict]
+# 무효화할 때마다 증가. 조회 중에 무효화가 끼어들면 이전 결과를 캐시에 저장하지 않도록 비교에 사용
+_cache_generation = 0
+
 
 # -----------------------------
 # helpers
@@ -31,107 +53,122 @@ def _to_circle_out(row: Circle) -> Dict[str, Any]:
     }
 
 
+def _list_circles_stmt(size: int):
+    return _LIST_CIRCLES + (lambda s: s.limit(size))
+
+
+async def warm_up(db: AsyncSession) -> None:
+    """서버 시작 시 목록 쿼리를 한 번 실행해 SQL 컴파일 캐시를 채움 (결과는 캐시에 넣지 않음)"""
+    await db.execute(_list_circles_stmt(20))
+
+
+def _invalidate_circle(circle_id: Optional[int] = None) -> None:
+    """서클 쓰기 후 캐시 무효화 (목록은 항상, 단건은 해당 id만)"""
+    global _cache_generation
+    _cache_generation += 1
+    if circle_id is not None:
+        _circle_cache.pop(circle_id, None)
+    _circle_list_cache.clear()
+
+
 @router.get("", response_model=List[CircleOut])
-def list_circles(
+async def list_circles(
     size: int = Query(20, ge=1, le=100, description="size"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    q = select(Circle).limit(size)
-    
+    cached = _circle_list_cache.get(("list", size))
+    if cached is not None:
+        return cached
+
+    q = _list_circles_stmt(size)
+    generation = _cache_generation
+
     try:
-        circle = db.execute(q).scalars().all()
-        return circle
+        circles = [_to_circle_out(row) for row in await db.execute(q)]
+        if generation == _cache_generation:
+            _circle_list_cache[("list", size)] = circles
+        return circles
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"query is invailed: {e}")
 
 
 
 @router.post("", response_model=CircleOut, status_code=status.HTTP_201_CREATED)
-def create_circle(payload: CircleCreate, db: Session = Depends(get_db)):
+async def create_circle(payload: CircleCreate, db: AsyncSession = Depends(get_db)):
 
     circle = payload.model_dump()
     circle["name"] = str(circle["name"]).strip()
-    if circle.get("image"):
-        circle["image"] = str(circle["image"])
-    if circle.get("sns_links_x"):
-        circle["sns_links_x"] = str(circle["sns_links_x"])
-    if circle.get("sns_links_instagram"):
-        circle["sns_links_instagram"] = str(circle["sns_links_instagram"])
-    if circle.get("sns_links_line"):
-        circle["sns_links_line"] = str(circle["sns_links_line"])
-
-    circle = Circle(**circle)
-
-    db.add(circle)
+
     try:
-        db.commit()
-        db.refresh(circle)
-        return circle
+        row = (await db.execute(insert(Circle).values(**circle).returning(Circle))).scalar_one()
+        await db.commit()
+        _invalidate_circle()
+        return row
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=409, detail="circle name already exists")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=f"cannot create circle: {e}")
 
 
 
 @router.get("/{circle_id}", response_model=CircleOut)
-def get_circle(circle_id: int, db: Session = Depends(get_db)):
-    row = db.get(Circle, circle_id)
+async def get_circle(circle_id: int, db: AsyncSession = Depends(get_db)):
+    cached = _circle_cache.get(circle_id)
+    if cached is not None:
+        return cached
+
+    generation = _cache_generation
+    row = await db.get(Circle, circle_id)
     if not row:
         raise HTTPException(status_code=404, detail="circle not found")
-    return _to_circle_out(row)
+    circle = _to_circle_out(row)
+    if generation == _cache_generation:
+        _circle_cache[circle_id] = circle
+    return circle
 
 
 
 @router.put("/{circle_id}", response_model=CircleOut)
-def update_circle(circle_id: int, payload: CircleUpdate, db: Session = Depends(get_db)):
-    row = db.get(Circle, circle_id)
-    if not row:
-        raise HTTPException(status_code=404, detail="circle not found")
-
+async def update_circle(circle_id: int, payload: CircleUpdate, db: AsyncSession = Depends(get_db)):
     update_data = payload.model_dump(exclude_unset=True)
+    if not update_data:
+        row = await db.get(Circle, circle_id)
+        if not row:
+            raise HTTPException(status_code=404, detail="circle not found")
+        return row
 
-    if update_data.get("image"):
-        update_data["image"] = str(update_data["image"])
-        
-    if update_data.get("sns_links_x"):
-        update_data["sns_links_x"] = str(update_data["sns_links_x"])
-    
-    if update_data.get("sns_links_instagram"):
-        update_data["sns_links_instagram"] = str(update_data["sns_links_instagram"])
-
-    if update_data.get("sns_links_line"):
-        update_data["sns_links_line"] = str(update_data["sns_links_line"])
-    
-
-    for key, value in update_data.items():
-        setattr(row, key, value)
-    
+    # UPDATE ... RETURNING 으로 조회 없이 한 번에 갱신
+    stmt = update(Circle).where(Circle.id == circle_id).values(**update_data).returning(Circle)
     try:
-        db.commit()
-        db.refresh(row)
-        return row
+        row = (await db.execute(stmt)).scalar_one_or_none()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=409, detail="circle name already exists")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"cannot update circle: {e}")
 
-
-
-@router.delete("/{circle_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_circle(circle_id: int, db: Session = Depends(get_db)):
-    row = db.get(Circle, circle_id)
     if not row:
         raise HTTPException(status_code=404, detail="circle not found")
+    _invalidate_circle(circle_id)
+    return row
+
+
 
-    db.delete(row)
+@router.delete("/{circle_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_circle(circle_id: int, db: AsyncSession = Depends(get_db)):
+    # DELETE ... RETURNING 으로 조회 없이 한 번에 삭제 (삭제된 행이 없으면 404)
+    stmt = delete(Circle).where(Circle.id == circle_id).returning(Circle.id)
     try:
-        db.commit()
-        return  
+        deleted = (await db.execute(stmt)).first()
+        await db.commit()
     except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail=f"cannot delete circle: {e}")
\ No newline at end of file
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"cannot delete circle: {e}")
+
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="circle not found")
+    _invalidate_circle(circle_id)
\ No newline at end of file
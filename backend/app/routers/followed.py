@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 
 from app.db import get_db
@@ -11,91 +12,97 @@ from app.security.auth_deps import get_current_user
 
 router = APIRouter(prefix="/api/followed", tags=["followed"])
 
+# 내 팔로우 목록 쿼리는 모듈 로드 시 한 번만 생성
+_MY_FOLLOWED = (
+    select(Followed)
+    .where(Followed.user_id == bindparam("user_id"))
+    .order_by(Followed.id.desc())
+)
+
+
+async def warm_up(db: AsyncSession) -> None:
+    """서버 시작 시 내 팔로우 목록 쿼리를 한 번 실행해 SQL 컴파일 캐시를 채움 (존재하지 않는 id로 실행)"""
+    await db.execute(_MY_FOLLOWED, {"user_id": 0})
+
+
 @router.get("", response_model=list[FollowedOut])
-def list_all_followed_circles(
-    db: Session = Depends(get_db)
+async def list_all_followed_circles(
+    db: AsyncSession = Depends(get_db)
 ):
 
+    # ORM 엔티티 대신 컬럼만 조회 (행마다 객체를 만들지 않음)
     stmt = (
-        select(Followed)
+        select(Followed.id, Followed.user_id, Followed.circle_id, Followed.date, Followed.is_admin)
         .order_by(Followed.id.desc())
     )
-    rows = db.execute(stmt).scalars().all()
-    return rows
+    return (await db.execute(stmt)).mappings().all()
 
 
 @router.get("/current_user", response_model=list[FollowedOut])
-def list_my_followed_circles(
+async def list_my_followed_circles(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    stmt = (
-        select(Followed)
-        .where(Followed.user_id == current_user.id)
-        .order_by(Followed.id.desc())
-    )
-    return db.execute(stmt).scalars().all()
+    return (await db.execute(_MY_FOLLOWED, {"user_id": current_user.id})).scalars().all()
 
 
 @router.post("", response_model=FollowedOut)
-def create_Followed(
+async def create_Followed(
     payload: FollowedCreate, 
     current_user: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     
     data = payload.model_dump()
     data["user_id"] = current_user.id
 
-    circle = db.execute(select(Circle.id).where(
-        Circle.id == payload.circle_id)
-        ).scalar_one_or_none()
-    
-    if not circle:
-        raise HTTPException(status_code=404, detail="circle not found")
-
-    # 重複チェックは current_user.id を使う
-    dup = db.execute(
-        select(Followed.id).where(
-            Followed.user_id == current_user.id,
-            Followed.circle_id == payload.circle_id
-        )
-    ).scalar_one_or_none()
-    if dup:
+    # INSERT ... ON CONFLICT DO NOTHING RETURNING: 정상 가입이면 1 round-trip으로 끝남
+    stmt = (
+        sqlite_insert(Followed)
+        .values(**data)
+        .on_conflict_do_nothing(index_elements=["user_id", "circle_id"])
+        .returning(Followed)
+    )
+    try:
+        followed = (await db.execute(stmt)).scalar_one_or_none()
+    except IntegrityError as e:
+        # FK 위반: SQLite는 어느 FK인지 알려주지 않으므로 서클이 없을 때만 404, 그 외(user_id 등)는 400
+        await db.rollback()
+        circle = (await db.execute(select(Circle.id).where(Circle.id == payload.circle_id))).scalar_one_or_none()
+        if not circle:
+            raise HTTPException(status_code=404, detail="circle not found")
+        raise HTTPException(status_code=400, detail=f"cannot create Followed: {getattr(e, 'orig', e)}")
+
+    # ON CONFLICT 로 삽입되지 않음 = 이미 가입
+    if followed is None:
         raise HTTPException(status_code=409, detail="already joined")
 
-    # 正しい user_id を含めて一度だけ作成
-    followed = Followed(**data)
-
-    db.add(followed)
     try:
-        db.commit()
-        db.refresh(followed)
+        await db.commit()
         return followed
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=409, detail="integrity error")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=f"cannot create Followed: {e}")
 
 
 
 @router.delete("/{circle_id}", status_code=204)
-def delete_Followed(
+async def delete_Followed(
     circle_id: int, 
     current_user: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
 
-    stmt = select(Followed).where(
+    stmt = delete(Followed).where(
         Followed.user_id == current_user.id, 
         Followed.circle_id == circle_id
-    )
-    row = db.execute(stmt).scalar_one_or_none()
+    ).returning(Followed.id)
+    deleted = (await db.execute(stmt)).first()
 
-    if not row:
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Followed relationship not found")
     
-    db.delete(row)
-    db.commit()
+    await db.commit()
@@ -1,39 +1,47 @@
 # app/routers/user.py 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select, func, or_
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, insert, update, delete, func, or_, union, lambda_stmt
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.db import get_db
-from app.models import User
+from app.models import User, users_fts, FTS_TRIGRAM_AVAILABLE
 from app.schemas import UserCreate, UserUpdate, UserOut
 from app.security.security import hash_pw
 
 
 router = APIRouter(prefix="/api/user", tags=["user"])
 
+# 목록 조회 쿼리는 모듈 로드 시 한 번만 생성 (요청마다 검색어/limit 값만 바인딩)
+# UserOut에 필요한 컬럼만 조회 (login_pass 해시는 읽지 않음)
+_LIST_USERS = lambda_stmt(lambda: select(
+    User.id, User.name, User.email, User.icon, User.login_id, User.created_at,
+))
 
-@router.get("", response_model=List[UserOut])
-def list_user(
-    size: int = Query(20, ge=1, le=100, description="size of user"),
-    search: str | None = Query(None, description="name/email/loginId"),
-    sort: str = Query("-id", description="sorted by: id|name|created_at, '-'decresed"),
-    db: Session = Depends(get_db),
-):
-    
-    q = select(User)
 
-        #search 탐색
+def _list_users_stmt(size: int, search: str | None = None, sort: str = "-id"):
+    q = _LIST_USERS
+
+    # search 탐색
     if search:
-            s = f"%{search.strip().lower()}%"
-            q = q.where(or_(
+        s = f"%{search.strip().lower()}%"
+        # 부분 일치는 trigram 인덱스(users_fts)로 검색
+        if FTS_TRIGRAM_AVAILABLE:
+            q += lambda q: q.where(User.id.in_(union(
+                select(users_fts.c.rowid).where(users_fts.c.name.like(s)),
+                select(users_fts.c.rowid).where(users_fts.c.email.like(s)),
+                select(users_fts.c.rowid).where(users_fts.c.login_id.like(s)),
+            )))
+        else:
+            q += lambda q: q.where(or_(
                 func.lower(User.name).like(s),
                 func.lower(User.email).like(s),
                 func.lower(User.login_id).like(s),
             ))
-        
-        # 정렬
+
+    # 정렬
     sort_map = {"id": User.id, "name": User.name, "created_at": User.created_at}
     desc = sort.startswith("-")
 
@@ -41,11 +49,28 @@ def list_user(
   
     col = sort_map.get(key, User.id) #key값으로 탐색 (디폴트 id)
 
-    q = q.order_by(col.desc() if desc else col.asc()).limit(size)
+    order = col.desc() if desc else col.asc()
+    q += lambda q: q.order_by(order).limit(size)
+    return q
+
+
+async def warm_up(db: AsyncSession) -> None:
+    """서버 시작 시 기본 목록 쿼리를 한 번 실행해 SQL 컴파일 캐시를 채움"""
+    await db.execute(_list_users_stmt(20))
+
+
+@router.get("", response_model=List[UserOut])
+async def list_user(
+    size: int = Query(20, ge=1, le=100, description="size of user"),
+    search: str | None = Query(None, description="name/email/loginId"),
+    sort: str = Query("-id", description="sorted by: id|name|created_at, '-'decresed"),
+    db: AsyncSession = Depends(get_db),
+):
+    
+    q = _list_users_stmt(size, search, sort)
 
     try:
-        user = db.execute(q).scalars().all()
-        return user
+        return (await db.execute(q)).mappings().all()
     
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Query is not working: {e}")
@@ -53,22 +78,19 @@ def list_user(
 
 
 @router.post("", response_model=UserOut, status_code=201)
-def create_user(payload: UserCreate, db: Session = Depends(get_db)):
+async def create_user(payload: UserCreate, db: AsyncSession = Depends(get_db)):
     
     user = payload.model_dump()
-    if user.get("icon"):
-        user["icon"] = str(user["icon"])
-    user["login_pass"] = hash_pw(user["login_pass"])
-    user = User(**user)
+    # bcrypt 해시는 CPU 작업이라 스레드풀에서 실행 (이벤트 루프를 막지 않음)
+    user["login_pass"] = await run_in_threadpool(hash_pw, user["login_pass"])
 
-    db.add(user)
     try:
-        db.commit()
-        db.refresh(user)
-        return user
+        row = (await db.execute(insert(User).values(**user).returning(User))).scalar_one()
+        await db.commit()
+        return row
     
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         # 이메일 또는 login_id의 UNIQUE 제약 조건 위반 시 409 반환
         raise HTTPException(
             status_code=409,detail="email or login id is already exist.")
@@ -76,8 +98,8 @@ def create_user(payload: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/{user_id}", response_model=UserOut)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.get(User, user_id)
+async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
+    user = await db.get(User, user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="Cannot find the user")
     return user
@@ -85,45 +107,44 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/{user_id}", response_model=UserOut)
-def update_user(user_id: int, payload: UserUpdate, db: Session = Depends(get_db)):
-    user = db.get(User, user_id)
-    if user is None:
-        raise HTTPException(status_code= 404, detail="Cannot find the user")
-
+async def update_user(user_id: int, payload: UserUpdate, db: AsyncSession = Depends(get_db)):
     # Pydantic이 None이 아닌 값들만 덤프 (exclude_unset=True)
     updated_user = payload.model_dump(exclude_unset=True)
-    if not updated_user:
-        return user
 
-    if updated_user.get("icon"):
-        updated_user["icon"] = str(updated_user["icon"]) 
-    
+    # 비밀번호 해시는 DB 커넥션을 잡기 전에 스레드풀에서 먼저 처리
     if updated_user.get("login_pass"):
-        updated_user["login_pass"] = hash_pw(updated_user["login_pass"])
+        updated_user["login_pass"] = await run_in_threadpool(hash_pw, updated_user["login_pass"])
 
-    for key, value in updated_user.items():
-        setattr(user, key, value)
-    
-    db.add(user)
-    try:
-        db.commit()
-        db.refresh(user)
+    if not updated_user:
+        user = await db.get(User, user_id)
+        if user is None:
+            raise HTTPException(status_code= 404, detail="Cannot find the user")
         return user
+
+    stmt = update(User).where(User.id == user_id).values(**updated_user).returning(User)
+    try:
+        user = (await db.execute(stmt)).scalar_one_or_none()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=409, detail="email or login_id is already exist")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"User update failed: {e}")
 
+    if user is None:
+        raise HTTPException(status_code= 404, detail="Cannot find the user")
+    return user
+
 
 
 @router.delete("/{user_id}", status_code=204)
-def delete_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.get(User, user_id)
-    if user is None:
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
+    deleted = (await db.execute(
+        delete(User).where(User.id == user_id).returning(User.id)
+    )).first()
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Cannot find the user")
     
-    db.delete(user)
-    db.commit()
+    await db.commit()
 
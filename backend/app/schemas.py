@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 from datetime import datetime, date
-from typing import Optional, Dict, List
+from typing import Annotated, Optional, Dict, List
 
-from pydantic import BaseModel, Field, AnyUrl, EmailStr, field_validator
+from pydantic import BaseModel, Field, AnyUrl, EmailStr, PlainSerializer, field_validator
 
 
 # 공통: ORM 객체 -> 스키마 변환 허용 (Pydantic v2)
@@ -12,6 +12,10 @@ class ORMConfig(BaseModel):
     model_config = {"from_attributes": True}
 
 
+# 입력용 URL: AnyUrl 로 검증하고 model_dump() 시 str 로 변환 (DB 컬럼이 문자열)
+UrlStr = Annotated[AnyUrl, PlainSerializer(str, when_used="unless-none")]
+
+
 # =========================
 # Users
 # =========================
@@ -19,7 +23,7 @@ class ORMConfig(BaseModel):
 class UserCreate(BaseModel):
     name: str = Field(..., max_length=40)
     email: EmailStr = Field(..., max_length=255)
-    icon: Optional[AnyUrl] = Field(None, max_length=200)
+    icon: Optional[UrlStr] = Field(None, max_length=200)
     login_id: str = Field(..., min_length=6, max_length=40)
     login_pass: str = Field(..., min_length=6, max_length=200)
 
@@ -34,7 +38,7 @@ class UserOut(ORMConfig):
 class UserUpdate(BaseModel):
     name: Optional[str] = Field(None, max_length=40)
     email: Optional[EmailStr] = Field(None, max_length=255)
-    icon: Optional[AnyUrl] = Field(None, max_length=200)
+    icon: Optional[UrlStr] = Field(None, max_length=200)
     login_id: Optional[str] = Field(None, min_length=6, max_length=40)
     login_pass: Optional[str] = Field(None, min_length=6, max_length=200)
 
@@ -77,12 +81,12 @@ class UserScheduleUpdate(BaseModel):
 class CircleCreate(BaseModel):
     name: str = Field(..., max_length=100)
     description: Optional[str] = None
-    image: Optional[AnyUrl] = Field(None, max_length=300)
+    image: Optional[UrlStr] = Field(None, max_length=300)
     tags: List[str] = Field(default_factory=list)
-    sns_links_x:Optional[AnyUrl] = Field(None, max_length=300)
-    sns_links_instagram:Optional[AnyUrl] = Field(None, max_length=300)
-    sns_links_line:Optional[AnyUrl] = Field(None, max_length=300)
-    
+    sns_links_x:Optional[UrlStr] = Field(None, max_length=300)
+    sns_links_instagram:Optional[UrlStr] = Field(None, max_length=300)
+    sns_links_line:Optional[UrlStr] = Field(None, max_length=300)
+
 
 class CircleOut(ORMConfig):
     id: int
@@ -99,11 +103,11 @@ class CircleOut(ORMConfig):
 class CircleUpdate(BaseModel):
     name: Optional[str] = Field(None, max_length=100)
     description: Optional[str] = None
-    image: Optional[AnyUrl] = Field(None, max_length=300)
+    image: Optional[UrlStr] = Field(None, max_length=300)
     tags: Optional[List[str]] = Field(default_factory=list)
-    sns_links_x:Optional[AnyUrl] = Field(None, max_length=300)
-    sns_links_instagram:Optional[AnyUrl] = Field(None, max_length=300)
-    sns_links_line:Optional[AnyUrl] = Field(None, max_length=300)
+    sns_links_x:Optional[UrlStr] = Field(None, max_length=300)
+    sns_links_instagram:Optional[UrlStr] = Field(None, max_length=300)
+    sns_links_line:Optional[UrlStr] = Field(None, max_length=300)
 
 
 # =========================